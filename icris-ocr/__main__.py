@@ -15,16 +15,20 @@ $ python -m icris_ocr document_directory -t Annual\ Return -p
 """
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
+import logging
 import multiprocessing as mp
 import os
 import traceback
-from queue import Queue
 
 import pandas as pd
 
 from document_layouts import *
 
+log = logging.getLogger(__name__)
+
 def process_doc_dir(doc_dir, doc_type = 'Annual Return'):
     """
     Process all images of a document's pages.
@@ -48,6 +52,34 @@ def process_doc_dir(doc_dir, doc_type = 'Annual Return'):
             doc_data = doc_instance.doc_data
             return doc_data
 
+def process_doc_dir_safe(doc_dir, doc_type = 'Annual Return'):
+    """
+    Process a document directory, capturing failures as data.
+
+    Parameters
+    ----------
+    doc_dir : str
+        Relative path to the directory containing images of document pages
+    doc_type : str
+        Specify type of document (default = 'Annual Return')
+
+    Returns
+    -------
+    tuple
+        ('ok', doc_data) on success, ('err', (doc_dir, traceback)) on
+        failure; KeyboardInterrupt and SystemExit propagate instead of
+        being recorded
+    """
+
+    try:
+        doc_data = process_doc_dir(doc_dir, doc_type)
+        assert (isinstance(doc_data, pd.DataFrame) or isinstance(doc_data, pd.Series))
+        return ('ok', doc_data)
+    except (KeyboardInterrupt, SystemExit):
+        raise
+    except BaseException:
+        return ('err', (doc_dir, traceback.format_exc(7)))
+
 def process_dir(dir, doc_type = 'Annual Return', parallel = False):
     """
     Process all document directories in a directory.
@@ -75,89 +107,67 @@ def process_dir(dir, doc_type = 'Annual Return', parallel = False):
     failed_list = []
 
     if parallel:
-        completed = 0
-        def worker(input, output, failed):
-            nonlocal completed
-            for doc_dir in iter(input.get, 'STOP'):
-                completed += 1
-                try:
-                    doc_data = process_doc_dir(doc_dir, doc_type)
-                    assert (isinstance(doc_data, pd.DataFrame) or isinstance(doc_data, pd.Series))
-                    output.put(doc_data)
-                except:
-                    exception = traceback.format_exc(7)
-                    failed.put((doc_dir, exception))
-                print(f'\t\t****{mp.current_process().name} is at iteration {completed}****')
-
-        NUMBER_OF_PROCESSES = mp.cpu_count() 
-
-        doc_list = [f'{dir}/{doc_dir}' for doc_dir in os.listdir(dir) if os.path.isdir(f'{dir}/{doc_dir}')]
-        num_doc = len(doc_list)
+        NUMBER_OF_PROCESSES = mp.cpu_count()
 
-        print(f"\t\t****Total documents to be processed: {num_doc}****\n\n")
-
-        task_manager = mp.Manager()
-        done_manager = mp.Manager()
-        failed_manager = mp.Manager()
-
-        task_queue = task_manager.Queue()
-        done_queue = done_manager.Queue()
-        failed_queue = failed_manager.Queue()
-            
-        for doc_dir in doc_list:
-            task_queue.put(doc_dir)
-
-        for i in range(NUMBER_OF_PROCESSES):
-            task_queue.put('STOP')
+        with os.scandir(dir) as entries:
+            doc_list = [entry.path for entry in entries if entry.is_dir()]
+        num_doc = len(doc_list)
 
-        process_list = [mp.Process(name=f'Process {str(i)}',
-                target=worker,
-                args=(task_queue, done_queue, failed_queue))
-                for i in range(NUMBER_OF_PROCESSES)]
+        log.info('Total documents to be processed: %d', num_doc)
 
-        for process in process_list:
-            process.start()
+        # Dispatch tasks in chunks so task/result pickling is amortized
+        # over chunksize documents instead of paid per document
+        chunk_size = max(1, num_doc // (NUMBER_OF_PROCESSES * 4))
 
-        for process in process_list:
-            process.join()
+        with ProcessPoolExecutor(max_workers=NUMBER_OF_PROCESSES) as executor:
+            results = executor.map(
+                partial(process_doc_dir_safe, doc_type=doc_type),
+                doc_list, chunksize=chunk_size)
 
-        while not done_queue.empty():
-            doc_data_list.append(done_queue.get())
-        
-        while not failed_queue.empty():
-            failed_list.append(failed_queue.get())
+            for completed, (tag, payload) in enumerate(results, 1):
+                if tag == 'ok':
+                    doc_data_list.append(payload)
+                else:
+                    failed_list.append(payload)
+                if completed % 50 == 0 or completed == num_doc:
+                    log.info('%d items processed out of %d', completed, num_doc)
 
     else:
-        doc_list = [f'{dir}/{doc_dir}'.replace('//', '/') for doc_dir in os.listdir(dir) if os.path.isdir(f'{dir}/{doc_dir}'.replace('//', '/'))]
+        with os.scandir(dir) as entries:
+            doc_list = [entry.path for entry in entries if entry.is_dir()]
         num_doc = len(doc_list)
 
-        print(f"\t\t****Total documents to be processed: {num_doc}****\n\n")
+        log.info('Total documents to be processed: %d', num_doc)
 
-        for count, doc_dir in enumerate(doc_list):
-            print(f'\t\t****{count} items processed out of {num_doc}****')
-            try:
-                doc_data = process_doc_dir(doc_dir, doc_type = doc_type)
-                doc_data_list.append(doc_data)
-            except:
-                exception = traceback.format_exc(7)
-                failed_list.append((doc_dir, exception))
+        for count, doc_dir in enumerate(doc_list, 1):
+            if count % 50 == 0 or count == num_doc:
+                log.info('%d items processed out of %d', count, num_doc)
+            tag, payload = process_doc_dir_safe(doc_dir, doc_type)
+            if tag == 'ok':
+                doc_data_list.append(payload)
+            else:
+                failed_list.append(payload)
         
     if len(failed_list) != 0:
-        failed_df = pd.Series(dict(failed_list))
+        failed_df = pd.DataFrame.from_records(failed_list, columns=['path', 'traceback'])
     else:
-        failed_df = pd.Series(['There were no exceptions'])
+        failed_df = pd.DataFrame({'msg': ['There were no exceptions']})
 
     if len(doc_data_list) != 0:
-        data_df = pd.concat(doc_data_list, axis = 0, sort=False)
+        # Align every frame on the first frame's columns so the concat
+        # takes the fast consolidated path instead of per-column alignment
+        columns = doc_data_list[0].columns
+        doc_data_list = [doc_data.reindex(columns=columns, copy=False) for doc_data in doc_data_list]
+        data_df = pd.concat(doc_data_list, axis = 0, sort=False, copy=False, ignore_index=True)
     else:
         data_df = pd.Series(['No documents were scraped successfully'])
 
-    print('\t\t****Task completed****')
-    print(data_df)
+    log.info('Task completed')
     return (data_df, failed_df)
 
 if __name__ == '__main__':
     mp.freeze_support()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
 
     parser = argparse.ArgumentParser()
     
@@ -172,17 +182,19 @@ if __name__ == '__main__':
         assert os.path.isdir(args.dir), "Must pass a directory containing images of document pages"
         data_df, failed_df = process_dir(args.dir, args.document_type, parallel = args.parallel)
 
-        writer = pd.ExcelWriter(f"OCR - {args.document_type} - {datetime.today().strftime('%c')}.xlsx", engine='xlsxwriter')
+        writer = pd.ExcelWriter(
+            f"OCR - {args.document_type} - {datetime.today().strftime('%c')}.xlsx",
+            engine='xlsxwriter')
         data_df.to_excel(writer, args.document_type)
         failed_df.to_excel(writer, 'Unsuccessful')
 
-        print("\t\t****Writing data to excel file****")
+        log.info('Writing data to excel file')
 
         writer.save()
     else:
         assert os.path.isdir(args.dir), "Must pass a directory containing images of document pages"
-        print("\t\t****Processing document****")
+        log.info('Processing document')
         data = AnnualReturn(args.dir).doc_data
-        print("\t\t****Writing data to excel file****")
+        log.info('Writing data to excel file')
         data.to_excel(f"OCR - {args.document_type} - {datetime.today().strftime('%c')}.xlsx")
-        print("\t\t****Task complete****")
+        log.info('Task complete')
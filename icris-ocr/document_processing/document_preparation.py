@@ -3,15 +3,130 @@ This module defines functions that prepare PDF documents for OCR.
 
 """
 
+import logging
 import re
 import os
 import multiprocessing as mp
-import threading
-import multiprocessing as mp
-from queue import Queue
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 
+import fitz
 import pytesseract
-import pdf2image as pdf
+
+try:
+    from tesserocr import PyTessBaseAPI
+except ImportError:
+    PyTessBaseAPI = None
+
+log = logging.getLogger(__name__)
+
+_tesseract_api = None
+
+def read_page(image_path):
+    """
+    Detect text in a single page image.
+
+    When `tesserocr` is installed, the Tesseract API object and its
+    language data stay resident in the worker process, so repeated
+    calls cost a function call instead of a subprocess launch plus
+    language-pack load. Falls back to `pytesseract` otherwise.
+
+    Parameters
+    ----------
+    image_path : str
+        Path to the image to be scanned
+
+    Returns
+    -------
+    str
+        Detected text contained in the image
+
+    """
+
+    global _tesseract_api
+
+    if PyTessBaseAPI is None:
+        return str(pytesseract.image_to_string(image_path))
+
+    if _tesseract_api is None:
+        _tesseract_api = PyTessBaseAPI()
+
+    _tesseract_api.SetImageFile(image_path)
+    return _tesseract_api.GetUTF8Text()
+
+# Render PDF pages at 330 DPI (PDF user space is 72 DPI)
+render_matrix = fitz.Matrix(330 / 72, 330 / 72)
+
+default_doc_types = [
+    'Annual Return',
+    'Incorporation Form',
+    'Notice of Change of Director',
+    'Notice of Change of Company Secretary',
+    'Notice of Alteration of Share Capital',
+    'Notice of Change in Particulars of Company Secretary',
+    'Notice of Change of Address',
+    'Notice of Resignation',
+    'Return of Allotment',
+    ]
+
+def write_pixmap(pix, page_path):
+    """Write a rendered pixmap to disk as a JPEG"""
+
+    # The pinned PyMuPDF (1.19.6) has no JPEG output of its own;
+    # pil_tobytes hands the raw samples to Pillow's encoder without
+    # writing an intermediate file
+    with open(page_path, 'wb') as page_file:
+        page_file.write(pix.pil_tobytes(format='JPEG', quality=85))
+
+def batch_ocr(image_paths, lang='eng'):
+    """
+    Detect text in a batch of images with a single tesseract invocation.
+
+    Tesseract accepts a newline-delimited list file and loads its
+    language data once for the whole batch, so the per-process startup
+    cost is paid once instead of once per image.
+
+    Parameters
+    ----------
+    image_paths : list
+        List of paths to the images to be scanned
+    lang : str, optional
+        Language configuration of the Tesseract engine
+
+    Returns
+    -------
+    list
+        Detected text of each image, in input order
+
+    """
+
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as list_file:
+        list_file.write('\n'.join(image_paths))
+        list_path = list_file.name
+
+    try:
+        output = subprocess.check_output(
+            ['tesseract', list_path, 'stdout', '-l', lang],
+            stderr=subprocess.DEVNULL, text=True)
+    finally:
+        os.remove(list_path)
+
+    # Tesseract emits a form feed between the pages of a list run
+    return output.split('\f')[:len(image_paths)]
+
+def compile_doc_types(doc_types):
+    """Compile a list of document types into a single alternation regex"""
+
+    return re.compile('(' + '|'.join(re.escape(doc_type) for doc_type in doc_types) + ')')
+
+default_doc_types_regex = compile_doc_types(default_doc_types)
+
+newline_regex = re.compile(r'\n{1,}')
+
+# Duplicate downloads end in a spaced, digit-bearing token, e.g. 'Name 2' or 'Name (2)'
+duplicate_regex = re.compile(r'\s+\S*\d\S*\s*$')
 
 def remove_duplicates(paths):
     """
@@ -24,48 +139,33 @@ def remove_duplicates(paths):
     
     """
 
-    def check_digit(string_list):
-        """
-        Check if string has digits at the end.
-
-        Parameters
-        ----------
-        string_list : list
-            List of parts of a string delimited by spaces
-
-        Returns
-        -------
-        isdigit : bool
-            Boolean specifying whether the string is a duplicate
-        
-        """
-
-        if len(string_list) == 1:
-            isdigit = False
-        
-        else:
-            check_string = string_list[-1]
-            check_string = re.sub(r'[^0-9]', '', check_string)
-            isdigit = check_string.isdigit()
-        return isdigit
-    
-    directory_path = '/'.join(paths[0].split('/')[:-1])
-    extension = None
-    if '.' in paths[0]:
-        extension = os.path.splitext(paths[0])[1]
-
-    paths = [os.path.splitext(path)[0] for path in paths]
-    names = [path.split('/')[-1] for path in paths]
-
-    # Remove all closing digits from the name
-    processed_names = [re.sub(r'\s{1,}', ' ', name).strip() for name in names]
-    split_names = [name.split(' ') for name in processed_names]
-    duplicates_removed = [directory_path + '/' + ' '.join(name) for name in split_names if not check_digit(name)]
-    
-    if not extension is None:
-        duplicates_removed = [name + extension for name in duplicates_removed]
+    basenames = [os.path.splitext(os.path.basename(path))[0] for path in paths]
 
-    return duplicates_removed
+    return [path for path, name in zip(paths, basenames) if duplicate_regex.search(name) is None]
+
+def render_page(pdf_file, page_number, document_directory):
+    """
+    Render one page of a PDF document to a JPEG page image.
+
+    A fitz.Document is not thread-safe, so every call opens its own
+    handle; the open is cheap next to a 330 DPI rasterization.
+
+    Parameters
+    ----------
+    pdf_file : str
+        Path to the PDF file to render from
+    page_number : int
+        Zero-based page number
+    document_directory : str
+        Path to directory the page image is written to
+
+    """
+
+    with fitz.open(pdf_file) as document:
+        page = document.load_page(page_number)
+        pix = page.get_pixmap(matrix=render_matrix, alpha=False)
+
+    write_pixmap(pix, os.path.join(document_directory, f'page_{page_number + 1}.jpg'))
 
 def convert(pdf_file):
     """
@@ -82,99 +182,119 @@ def convert(pdf_file):
     if os.path.splitext(pdf_file)[1] == '.pdf':
         file_name = str(pdf_file)[:-4]
         try:
-            file = pdf.convert_from_path(pdf_file, 330)
+            with fitz.open(pdf_file) as document:
+                page_count = document.page_count
+            document_directory = os.path.join(os.getcwd(), file_name)
             try:
                 os.mkdir(file_name)
             except:
                 pass
-            for count, page in enumerate(file,1):
-                page_name = "page_"+ str(count)+ ".jpg"
-                page.save(str(os.getcwd()) + '/' + file_name + '/' + page_name, 'JPEG')
+            # MuPDF releases the GIL while rendering, so pages can be
+            # rasterized concurrently, but a Document must not be
+            # shared across threads: each render opens its own handle
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(
+                    lambda page_number: render_page(pdf_file, page_number, document_directory),
+                    range(page_count)))
         except:
-            print(f'{pdf_file} could not be converted')
+            log.warning('%s could not be converted', pdf_file)
     else:
-        print(f'{pdf_file} is not a PDF')
+        log.warning('%s is not a PDF', pdf_file)
 
-def dir_convert(directory, parallel=True):
+def convert_pdf(directory, target_directory, pdf_file):
     """
-    Convert a directory of PDF files.
-    
+    Convert a PDF file to a directory of JPEG images.
+
     Parameters
     ----------
     directory : str
-        Path to directory containing PDF files
+        Relative path to directory containing the PDF file
+    target_directory : str
+        Path to directory to store the image directory in
+    pdf_file : str
+        Name of the PDF file
 
     """
 
-    def convert_pdf(pdf_file):
-        """
-        Convert PDF file to JPEG images.
+    file_parts = os.path.splitext(pdf_file)
 
-        Parameters
-        ----------
-        pdf_file : str
-            Relative path to PDF file
-        target_directory : str
-            Directory in the current directory to store images in
-        
-        """
+    if file_parts[1] == '.pdf':
+        document = fitz.open(os.path.join(directory, pdf_file))
+        document_directory = os.path.join(target_directory, file_parts[0])
 
-        file_parts = os.path.splitext(pdf_file)
+        try:
+            os.mkdir(document_directory)
+        except Exception:
+            pass
 
-        if file_parts[1] == '.pdf':
-            jpeg_file = pdf.convert_from_path(f'{directory}/{pdf_file}', 330)
-            document_directory = current_dir + '/' + target_directory + '/' + file_parts[0]
+        for order, page in enumerate(document,1):
+            page_name = os.path.join(document_directory, f'page_{order}.jpg')
+            pix = page.get_pixmap(matrix=render_matrix, alpha=False)
+            write_pixmap(pix, page_name)
+        document.close()
 
-            try:
-                os.mkdir(document_directory)
-            except Exception:
-                pass
+def convert_worker(input_queue, unsuccessful_queue, counter, directory, target_directory):
+    """
+    Queue worker for `dir_convert`.
+
+    Defined at module level so it stays picklable under the `spawn`
+    start method; `counter` is a `multiprocessing.Value` shared across
+    all worker processes.
+
+    """
 
-            for order, page in enumerate(jpeg_file,1):
-                page_name = document_directory + "/page_" + str(order) + ".jpg"
-                page.save(page_name, 'JPEG')
+    for pdf_file in iter(input_queue.get, 'STOP'):
+        with counter.get_lock():
+            counter.value += 1
+            completed = counter.value
+        if completed % 50 == 0:
+            log.info('%d files converted', completed)
+        try:
+            convert_pdf(directory, target_directory, pdf_file)
+        except:
+            unsuccessful_queue.put(pdf_file)
+
+    unsuccessful_queue.put('STOP')
+
+def dir_convert(directory, parallel=True):
+    """
+    Convert a directory of PDF files.
+
+    Parameters
+    ----------
+    directory : str
+        Path to directory containing PDF files
+
+    """
 
     current_dir = os.getcwd()
 
     unsuccessful_list = []
 
-    completed = 0
-
     if os.path.isdir(directory):
-    
+
         target_directory = directory + '_JPEGs'
         try:
             os.mkdir(target_directory)
         except Exception:
             pass
 
+        target_path = os.path.join(current_dir, target_directory)
+
         files = os.listdir(directory)
         files = remove_duplicates(files)
         number_of_files = len(files)
 
         if parallel:
 
-            def worker(input_queue, unsuccessful_queue):
-                nonlocal current_dir, completed
-
-                for pdf_file in iter(input_queue.get, 'STOP'):
-                    print(f'{mp.current_process().name} is at iteration {completed}')
-                    completed += 1
-                    try:
-                        convert_pdf(pdf_file)
-                    except:
-                        unsuccessful += 1
-                        unsuccessful_queue.put(pdf_file)
-            
-            NUMBER_OF_PROCESSES = mp.cpu_count() // 2
+            counter = mp.Value('i', 0)
 
-            print(f"\t\t****Total documents to be processed: {number_of_files}****\n\n")
+            NUMBER_OF_PROCESSES = mp.cpu_count() // 2
 
-            task_manager = mp.Manager()
-            unsuccessful_manager = mp.Manager()
+            log.info('Total documents to be processed: %d', number_of_files)
 
-            task_queue = task_manager.Queue()
-            unsuccessful_queue = unsuccessful_manager.Queue()
+            task_queue = mp.Queue()
+            unsuccessful_queue = mp.Queue()
 
             for pdf_file in files:
                 task_queue.put(pdf_file)
@@ -184,56 +304,50 @@ def dir_convert(directory, parallel=True):
 
             process_list = [mp.Process(
                 name=f'Process {str(i)}',
-                target=worker, args=(task_queue,
-                unsuccessful_queue))
+                target=convert_worker, args=(task_queue,
+                unsuccessful_queue, counter, directory, target_path))
                 for i in range(NUMBER_OF_PROCESSES)]
 
             for process in process_list:
                 process.start()
 
+            # Drain the failure queue before joining: a worker cannot
+            # exit until its queue feeder thread has flushed, so
+            # joining first deadlocks once the failed names overrun
+            # the pipe buffer
+            finished = 0
+            while finished < NUMBER_OF_PROCESSES:
+                pdf_file = unsuccessful_queue.get()
+                if pdf_file == 'STOP':
+                    finished += 1
+                else:
+                    unsuccessful_list.append(pdf_file)
+
             for process in process_list:
                 process.join()
-
-            while not task_queue.empty():
-                pass
-
-            while not unsuccessful_queue.empty():
-                unsuccessful_list.append(unsuccessful_queue.get())
             
         else:
-            print(f'{len(files)} files to be converted')
+            log.info('%d files to be converted', len(files))
             
             for order, pdf_file in enumerate(files):
                 try:
-                    convert_pdf(pdf_file)
+                    convert_pdf(directory, target_path, pdf_file)
                 except:
                     unsuccessful_list.append(pdf_file)
-                print(f'{order} files processed')
+                if order % 50 == 0:
+                    log.info('%d files processed', order)
             
 
     if len(unsuccessful_list) > 0:
-        print('The following files could not be converted:')
+        log.warning('The following files could not be converted:')
         for order, pdf_file in enumerate(unsuccessful_list, 1):
-            print(f'{str(order)}. {pdf_file}')
+            log.warning('%d. %s', order, pdf_file)
     else:
-        print('All files converted successfully')
-
-def categorize(
-    directory,
-    doc_types=[
-        'Annual Return',
-        'Incorporation Form',
-        'Notice of Change of Director',
-        'Notice of Change of Company Secretary',
-        'Notice of Alteration of Share Capital',
-        'Notice of Change in Particulars of Company Secretary',
-        'Notice of Change of Address',
-        'Notice of Resignation',
-        'Return of Allotment',
-        ]
-        ):
+        log.info('All files converted successfully')
+
+def categorize(directory, doc_types=default_doc_types, doc_string=None):
     """
-    Categorize directory of document page images based on a the title 
+    Categorize directory of document page images based on a the title
     of the first page in the directory.
 
     Parameters
@@ -241,76 +355,61 @@ def categorize(
     directory : str
         Path to document directory
     doc_types : list, optional
-        List of strings specifying types of document to categorize, 
-        default ['Annual Return', 'Incorporation Form', 
+        List of strings specifying types of document to categorize,
+        default ['Annual Return', 'Incorporation Form',
         'Notice of Change of Director', 'Notice of Chage of Company Secretary']
+    doc_string : str, optional
+        Already-OCRed text of the first page; pass to skip the
+        per-document tesseract call (see `batch_ocr`)
 
     """
 
     assert os.path.isdir(directory), "Argument `directory` must be a string specifying relative path to document directory"
 
-    if os.path.isdir(directory):
-        current_directory = os.getcwd()
+    # Categorical directories are created beside the document directory;
+    # paths stay absolute so concurrent workers never touch the process CWD
+    directory = os.path.abspath(directory)
+    parent_directory = os.path.dirname(directory)
+    directory_name = os.path.basename(directory)
 
-        # Individual components of the path to document directory
-        path_components = directory.split('/')
-        number_of_components = len(path_components)
+    if doc_types is default_doc_types:
+        doc_types_regex = default_doc_types_regex
+    else:
+        doc_types_regex = compile_doc_types(doc_types)
 
-        if number_of_components > 1:
-            os.chdir('/'.join(path_components[:-1]))
-            directory = path_components[-1]
+    try:
+        if doc_string is None:
+            doc_string = read_page(os.path.join(directory, 'page_1.jpg'))
+        doc_string = newline_regex.sub(' ', doc_string.strip())
 
-        try:
-            doc_string = re.sub(r'\n{1,}', ' ', str(pytesseract.image_to_string(
-                f'{directory}/page_1.jpg')).strip())
-            
-            match = False
-            for doc_type in doc_types:
-                doc_pattern = re.compile(r'%s' % format(doc_type))
-                matches = doc_pattern.findall(doc_string)
-
-                if len(matches) > 0:
-                    
-                    try:
-                        os.mkdir(doc_type)
-                    except:
-                        pass
-
-                    if 'Non-Hong Kong' in doc_string:
-                        try:
-                            os.mkdir(f'{doc_type}/{doc_type}s of Registered Non-Hong Kong Companies/{directory}')
-                        except:
-                            pass
-                        os.rename(directory, f'{doc_type}/{doc_type}s of Registered Non-Hong Kong Companies/{directory}')
-                    elif 'Ordinance' in doc_string:
-                        try:
-                            os.mkdir(f'{doc_type}/{doc_type}s of Registered Non-Hong Kong Companies/{directory}')
-                        except:
-                            pass
-                        os.rename(directory, f'{doc_type}/{doc_type}s of Registered Non-Hong Kong Companies/{directory}')
-                    else:
-                        try:
-                            os.mkdir(f'{doc_type}/{doc_type}')
-                        except:
-                            pass
-                        os.rename(directory,f'{doc_type}/{doc_type}/{directory}') 
-                    
-                    print(f'Document {directory} is of type `{doc_type}`')
-                    match = True
-                    break
-            
-            if not match:
-                try:
-                    os.mkdir('Miscellaneous')
-                except:
-                    pass
-                os.rename(directory, f'Miscellaneous/{directory}')
+        match = doc_types_regex.search(doc_string)
+        if match:
+            doc_type = match.group(1)
 
-        except:
-            print(f'Directory {directory} could not be categorized')
+            if 'Non-Hong Kong' in doc_string or 'Ordinance' in doc_string:
+                category_directory = os.path.join(
+                    parent_directory, doc_type, f'{doc_type}s of Registered Non-Hong Kong Companies')
+            else:
+                category_directory = os.path.join(parent_directory, doc_type, doc_type)
+
+            os.makedirs(category_directory, exist_ok=True)
+            os.rename(directory, os.path.join(category_directory, directory_name))
+
+            log.info('Document %s is of type `%s`', directory_name, doc_type)
+
+        else:
+            category_directory = os.path.join(parent_directory, 'Miscellaneous')
+            os.makedirs(category_directory, exist_ok=True)
+            os.rename(directory, os.path.join(category_directory, directory_name))
+
+    except:
+        log.warning('Directory %s could not be categorized', directory)
+
+def categorize_worker(doc_types, task):
+    """Pool worker for `dir_categorize`; unpacks a (directory, doc_string) task"""
 
-        finally:
-            os.chdir(current_directory)
+    document_directory, doc_string = task
+    categorize(document_directory, doc_types=doc_types, doc_string=doc_string)
 
 def dir_categorize(
                 directory,
@@ -336,55 +435,40 @@ def dir_categorize(
 
     """
 
-    document_directories = [directory + '/' + document_directory for document_directory in os.listdir(directory)]
+    with os.scandir(directory) as entries:
+        document_directories = [entry.path for entry in entries if entry.is_dir()]
     document_directories = remove_duplicates(document_directories)
     number_of_documents = len(document_directories)
-    
-    completed = 0
 
     if parallel:
-        
-        def worker(input_queue):
-            nonlocal completed
-            for document_directory in iter(input_queue.get, 'STOP'):
-                # print(document_directory)
-                completed += 1
-                categorize(document_directory)
-        
-        print(f"\t\t****Total documents to be processed: {number_of_documents}****\n\n")
-
-        NUMBER_OF_THREADS = mp.cpu_count()
-        # task_manager = mp.Manager()
-        task_queue = Queue()
-
-        for document_directory in document_directories:
-            task_queue.put(document_directory)
-
-        for i in range(NUMBER_OF_THREADS):
-            task_queue.put('STOP')
-
-        process_list = [threading.Thread(
-            name=f'Thread {str(i)}',
-            target=worker,
-            args=(task_queue,), daemon = True)
-            for i in range(NUMBER_OF_THREADS)]
-
-        for process in process_list:
-            process.start()
-
-        for process in process_list:
-            process.join()
-        
+        log.info('Total documents to be processed: %d', number_of_documents)
+
+        NUMBER_OF_PROCESSES = mp.cpu_count()
+
+        # OCR every first page in one tesseract run, then categorize with
+        # the pre-read strings; fall back to per-document OCR if the
+        # batch run fails
+        page_paths = [os.path.join(document_directory, 'page_1.jpg') for document_directory in document_directories]
+        try:
+            doc_strings = batch_ocr(page_paths)
+        except Exception:
+            doc_strings = [None] * number_of_documents
+
+        with ProcessPoolExecutor(max_workers=NUMBER_OF_PROCESSES) as executor:
+            list(executor.map(
+                partial(categorize_worker, doc_types),
+                zip(document_directories, doc_strings), chunksize=8))
+
     else:
-        print(f"\t\t****Total documents to be processed: {number_of_documents}****\n\n")
+        log.info('Total documents to be processed: %d', number_of_documents)
 
-        for order, document_directory in enumerate(document_directories):
-            if os.path.isdir(document_directory):
-                categorize(document_directory, doc_types=doc_types)
+        for order, document_directory in enumerate(document_directories, 1):
+            categorize(document_directory, doc_types=doc_types)
 
-            print(f'{order} documents processed')
+            if order % 50 == 0:
+                log.info('%d documents processed', order)
 
-    print('Categorization complete')
+    log.info('Categorization complete')
 
 def convert_and_categorize(directory, parallel = True):
     """
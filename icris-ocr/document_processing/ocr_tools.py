@@ -5,27 +5,146 @@ thin lines and a high degree of variability.
 
 """
 
-import math
 import random
 import re
+import threading
 
 import cv2
 import numpy as np
 from pytesseract import image_to_string
-from scipy import ndimage
+from scipy.signal import convolve2d
 from skimage.morphology import skeletonize
-from skimage.util import img_as_float, img_as_ubyte
+try:
+    from tesserocr import PyTessBaseAPI
+except ImportError:
+    PyTessBaseAPI = None
 
 from .string_processing import clean_number, clean_single_character
 
 morph_kernel = np.ones((3,3), np.uint8)
 
-vertical_kernel = np.ones((3,1), np.uint8)
-horizontal_kernel = np.ones((1,3), np.uint8)
-
 vertical_structuringElement = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 20))
 horizontal_structuringElement = cv2.getStructuringElement(cv2.MORPH_RECT, (30, 1))
 
+# Kernels built once at import so the hot paths do not re-allocate
+# them on every call
+tall_dilate_kernel = np.ones((10,1))
+wide_dilate_kernel = np.ones((1,10))
+short_dilate_kernel = np.ones((2,1))
+narrow_dilate_kernel = np.ones((1,2))
+
+line_vertical_dilating_kernel = np.ones((5,1))
+line_horizontal_eroding_kernel = np.ones((1,21))
+line_vertical_eroding_kernel = np.ones((21,1))
+line_horizontal_dilating_kernel = np.ones((1,5))
+
+vertical_thickening_kernel = np.ones((3,1), np.uint8)
+horizontal_thickening_kernel = np.ones((1,7), np.uint8)
+
+sharpen_kernel = np.array([
+            [-1, -1, -1], 
+            [-1, 9, -1], 
+            [-1, -1, -1]])
+
+# Applying the 3x3 sharpen twice equals one pass with its 5x5
+# self-convolution (the kernel is symmetric), so the image only
+# travels through filter2D once
+fused_sharpen_kernel = convolve2d(sharpen_kernel, sharpen_kernel)
+
+def skeletonize_image(binary_img):
+    """
+    Thin a binary image down to single-pixel-wide lines.
+
+    Prefers the native uint8 Zhang-Suen thinning from opencv-contrib,
+    which runs in a single pass with no dtype conversion; without the
+    contrib build it falls back to skimage on a boolean view rather
+    than round-tripping the whole page through float64 with
+    `img_as_float`/`img_as_ubyte`.
+
+    Parameters
+    ----------
+    binary_img : numpy.array
+        Thresholded uint8 image with non-zero foreground
+
+    Returns
+    -------
+    numpy.array
+        uint8 skeleton with foreground at 255
+
+    """
+
+    if hasattr(cv2, 'ximgproc'):
+        binary_img = cv2.threshold(binary_img, 0, 255, cv2.THRESH_BINARY)[1]
+        return cv2.ximgproc.thinning(binary_img, thinningType=cv2.ximgproc.THINNING_ZHANGSUEN)
+
+    return skeletonize(binary_img > 0).astype(np.uint8) * 255
+
+
+tesseract_apis = threading.local()
+psm_regex = re.compile(r'--psm\s+(\d+)')
+alnum_regex = re.compile('[^a-zA-Z0-9]')
+
+def ocr_image(img, lang='eng', config='', psm=None):
+    """
+    Run the Tesseract engine over an image array and return the text.
+
+    When `tesserocr` is installed, the C++ API is kept resident in a
+    per-thread, per-language cache, so repeated calls reuse the loaded
+    language pack instead of forking a tesseract subprocess per box
+    the way `pytesseract` does, and concurrent page threads each run
+    their own engine. Without `tesserocr` the call falls back to
+    `pytesseract` unchanged.
+
+    Parameters
+    ----------
+    img : numpy.array
+        Image array to be scanned
+    lang : str, optional
+        Language for the Tesseract engine
+    config : str, optional
+        Configuration string in `pytesseract` format; only the
+        '--psm N' option is honoured by the resident API
+    psm : int, optional
+        Page segmentation mode, pre-parsed; takes precedence over any
+        '--psm N' in `config`
+
+    Returns
+    -------
+    str
+        Detected text
+    """
+
+    if PyTessBaseAPI is None:
+        if psm is not None:
+            config = f"{config or ''} --psm {psm}".strip()
+        return image_to_string(img, lang=lang, config=config or '')
+
+    # A PyTessBaseAPI is not thread-safe, and a process-wide instance
+    # behind a lock would serialize the page threads' OCR work, so
+    # each thread keeps its own engine per language
+    apis = getattr(tesseract_apis, 'by_lang', None)
+    if apis is None:
+        apis = tesseract_apis.by_lang = {}
+
+    api = apis.get(lang)
+    if api is None:
+        api = apis[lang] = PyTessBaseAPI(lang=lang)
+
+    if psm is None:
+        match = psm_regex.search(config or '')
+        psm = int(match.group(1)) if match else 3
+    api.SetPageSegMode(psm)
+
+    # Sliced crops are non-contiguous views; copy into one packed
+    # buffer and hand the raw bytes to the engine instead of
+    # round-tripping through PIL's encode path
+    img = np.ascontiguousarray(img)
+    height, width = img.shape[:2]
+    channels = img.shape[2] if img.ndim == 3 else 1
+    api.SetImageBytes(img.tobytes(), width, height, channels, width * channels)
+
+    return api.GetUTF8Text()
+
 def load_image(img):  
     """
     Load image and prepare for edge detection.
@@ -42,13 +161,13 @@ def load_image(img):
 
     """
 
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    thresh = cv2.threshold(gray, 120, 255, cv2.THRESH_BINARY)[1]
-    inv = 255 - thresh
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+    inv = cv2.threshold(gray, 120, 255, cv2.THRESH_BINARY_INV)[1]
 
-    dilated_vertical = cv2.dilate(inv, vertical_kernel)
-    dilated = cv2.dilate(dilated_vertical, horizontal_kernel)
-    processed_inv = cv2.erode(dilated, morph_kernel)
+    # The 3x1 and 1x3 dilations compose to one 3x3 dilation, and dilate
+    # followed by erode with the same kernel is a morphological close,
+    # so the three passes fuse into a single call
+    processed_inv = cv2.morphologyEx(inv, cv2.MORPH_CLOSE, morph_kernel)
     processed_inv = cv2.GaussianBlur(processed_inv, (3,3), 0)
 
     return processed_inv
@@ -70,34 +189,38 @@ def calculate_angle(boxes):
 
     """
 
-    img_edges = img_as_ubyte(skeletonize(img_as_float(boxes)))
-    lines = cv2.HoughLinesP(img_edges, 1, 1 / 180.0, 100, minLineLength=270, maxLineGap=20)
+    # The skew angle is scale-invariant, so estimate it on a quarter-
+    # scale view and cut the per-angle work by 16x
+    scale = 0.25
+    small = cv2.resize(boxes, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    ys, xs = np.nonzero(small > 127)
 
-    angles = []
+    if ys.size == 0:
+        return 0
 
-    try:
-        for line in lines:
-            x1, y1, x2, y2 = line[0]
-            angle = math.degrees(math.atan2(y2 - y1, x2 - x1))
-            if angle != 0 and angle != -90:
-                if angle > 30:
-                    angle = 90 - angle
-                if angle < -30:
-                    angle = angle + 90
-                angles.append(angle)
-
-        if len(angles) != 0:
-            skew_angle = np.mean(angles)
-        else:
-            skew_angle = 0
-    except:
-        skew_angle = 0
+    def profile_score(angle):
+        # Shear approximates rotation for the sub-degree angles handled
+        # here: collapse each foreground pixel onto its sheared row and
+        # score how sharply the row profile peaks
+        rows = (ys - np.tan(np.radians(angle)) * xs).astype(np.int32)
+        profile = np.bincount(rows - rows.min())
+        return np.square(np.diff(profile)).sum()
 
-    return skew_angle
+    coarse_angles = np.arange(-3, 3.01, 0.5)
+    skew_angle = max(coarse_angles, key=profile_score)
 
-def rotate_image(img, angle):
+    fine_angles = np.arange(skew_angle - 0.5, skew_angle + 0.51, 0.05)
+    skew_angle = max(fine_angles, key=profile_score)
+
+    return float(skew_angle)
+
+def rotate_image(img, angle, flags=cv2.INTER_LINEAR):
     """
-    Rotate image.
+    Rotate image around its centre.
+
+    The canvas size is kept, so coordinates detected on the rotated
+    image stay valid; at the sub-degree skew angles handled here the
+    cropped border is negligible.
 
     Parameters
     ----------
@@ -105,10 +228,17 @@ def rotate_image(img, angle):
         Image to be rotated
     angle : float
         Degree by which the image is to be rotated
+    flags : int, optional
+        OpenCV interpolation flags (pass 'cv2.INTER_NEAREST' for
+        binary masks)
 
     """
 
-    img_rotated = ndimage.rotate(img, angle)
+    height, width = img.shape[:2]
+    rotation_matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    img_rotated = cv2.warpAffine(
+        img, rotation_matrix, (width, height),
+        flags=flags, borderMode=cv2.BORDER_REPLICATE)
 
     return img_rotated
 
@@ -166,14 +296,14 @@ def detect_boxes(
         Parameter thin_alignment must equal 'vertical' or 'horizontal'
         """
         if thin_alignment == 'vertical':
-            vertical_dilate_kernel = np.ones((10,1))
-            horizontal_dilate_kernel = np.ones((1,2))
+            vertical_dilate_kernel = tall_dilate_kernel
+            horizontal_dilate_kernel = narrow_dilate_kernel
         elif thin_alignment == 'horizontal':
-            vertical_dilate_kernel = np.ones((2,1))
-            horizontal_dilate_kernel = np.ones((1,10))
+            vertical_dilate_kernel = short_dilate_kernel
+            horizontal_dilate_kernel = wide_dilate_kernel
     else:
-        horizontal_dilate_kernel = np.ones((1,10))
-        vertical_dilate_kernel = np.ones((10,1))
+        horizontal_dilate_kernel = wide_dilate_kernel
+        vertical_dilate_kernel = tall_dilate_kernel
 
     vertical_lines = cv2.erode(processed_inv, vertical_structuringElement, iterations = vertical_iterations)
     vertical_lines = cv2.dilate(vertical_lines, vertical_structuringElement, iterations = vertical_iterations)    
@@ -186,13 +316,12 @@ def detect_boxes(
     boxes = cv2.bitwise_or(horizontal_lines, vertical_lines)
 
     if align:
-        align = False
         skew_angle = calculate_angle(boxes)
         if skew_angle > 0.15 or skew_angle < -0.15:
-            img_rotated = rotate_image(processed_inv, skew_angle)
-            boxes_thinned = detect_boxes(img_rotated, thin_lines = thin_lines, thin_alignment = thin_alignment, align = align, skel = skel, canny = canny, vertical_iterations = vertical_iterations, horizontal_iterations = horizontal_iterations)
-            skel = False
-            canny = False
+            # Morphology commutes with rotation at sub-degree skew, so
+            # re-warping the computed line mask replaces re-running the
+            # whole erode/dilate pipeline on the rotated page
+            boxes = rotate_image(boxes, skew_angle, flags=cv2.INTER_NEAREST)
     
     if canny:
         skel = False
@@ -201,15 +330,35 @@ def detect_boxes(
 
     if skel:
         boxes = cv2.threshold(boxes, thresh_value, 255, cv2.THRESH_BINARY)[1]
-        boxes = img_as_float(boxes)
-        boxes_thinned = skeletonize(boxes)
-        boxes_thinned = img_as_ubyte(boxes_thinned)
+        boxes_thinned = skeletonize_image(boxes)
     
     try:
         return skew_angle, boxes_thinned
     except:
         return boxes_thinned
 
+# Contiguous record layout for box geometry: sorting and iteration
+# touch one packed array instead of scattered Python tuples
+box_dtype = np.dtype([('area', 'i4'), ('x', 'i4'), ('y', 'i4'), ('w', 'i4'), ('h', 'i4')])
+
+def box_coordinates(box):
+    """Return the (x, y, w, h) bounding rectangle of a box record."""
+
+    return int(box['x']), int(box['y']), int(box['w']), int(box['h'])
+
+def largest_boxes(box_info, num):
+    """
+    Return the `num` largest box records in descending area order.
+
+    A partial partition keeps only the candidates before sorting, so
+    selecting a handful of boxes out of hundreds of components costs
+    O(n + num log num) instead of a full sort.
+    """
+
+    if len(box_info) > num:
+        box_info = box_info[np.argpartition(box_info['area'], -num)[-num:]]
+    return np.sort(box_info, order='area')[::-1]
+
 def get_boxes_info(
     boxes_thinned,
     retr_mode,
@@ -230,23 +379,23 @@ def get_boxes_info(
     
     Returns
     -------
-    box_info : list
-        List of tuples containing information about the areas and boung
-        ing rectangles of each contour (used for sorting algorithms)
+    box_info : numpy.array
+        Structured array with fields 'area', 'x', 'y', 'w', 'h', one
+        record per box (used for sorting algorithms)
     """
 
+    # Contour retrieval is kept deliberately: on the Canny pages each
+    # hollow box yields nested outer and inner perimeter loops, which
+    # RETR_EXTERNAL suppresses but connected components would report
+    # as near-duplicate records, displacing real boxes from the top-K
+    # area selection
     contours = cv2.findContours(boxes_thinned, retr_mode, cv2.CHAIN_APPROX_SIMPLE)[0]
 
-    areas = []
-    coordinates_list = []
+    box_info = np.empty(len(contours), dtype=box_dtype)
 
-    for contour in contours:
+    for order, contour in enumerate(contours):
         x, y, w, h = cv2.boundingRect(contour)
-        area = w * h
-        areas.append(area)
-        coordinates_list.append([x, y, w, h])
-
-    box_info = [box for box in zip(areas, coordinates_list)]
+        box_info[order] = (w * h, x, y, w, h)
 
     return box_info
 
@@ -274,9 +423,10 @@ def process_image(
 
     Returns
     -------
-    boxes_info : list
-        List of tuples containing information about the areas and boung
-        ing rectangles of each contour (used for sorting algorithms)
+    img : numpy.array
+        The source image, deskewed when a significant skew was found
+    boxes_info : numpy.array
+        Structured array of box records (used for sorting algorithms)
 
     """
 
@@ -292,8 +442,14 @@ def process_image(
         vertical_iterations=vertical_iterations,
         horizontal_iterations=horizontal_iterations)
 
+    # The box coordinates refer to the deskewed line mask, so the
+    # source image is brought into the same frame here instead of by a
+    # duplicated conditional in every page class
+    if skew_angle > 0.15 or skew_angle < -0.15:
+        img = rotate_image(img, skew_angle)
+
     boxes_info = get_boxes_info(boxes_thinned, retr_mode, approx_method)
-    return skew_angle, boxes_info
+    return img, boxes_info
 
 def save_box(img, coordinates, rank, title = 'box'):
     """Convenience function to save a part of the image defined by the box."""
@@ -324,38 +480,30 @@ def get_line_coordinates(gray_box, v_num, h_num):
         List containing the y-coordinates of each horizontal line
     """
 
-    thresh = cv2.threshold(gray_box, 150, 255, cv2.THRESH_BINARY)[1]
-    inv = 255 - thresh
-
-    vertical_dilating_kernel = np.ones((5,1))
-    horizontal_eroding_kernel = np.ones((1,21))
-    vertical_eroding_kernel = np.ones((21,1))
-    horizontal_dilating_kernel = np.ones((1,5))
+    inv = cv2.threshold(gray_box, 150, 255, cv2.THRESH_BINARY_INV)[1]
 
-    gray_box = cv2.dilate(inv, vertical_dilating_kernel, iterations=3)
-    gray_box = cv2.dilate(gray_box, horizontal_dilating_kernel, iterations=2)
+    gray_box = cv2.dilate(inv, line_vertical_dilating_kernel, iterations=3)
+    gray_box = cv2.dilate(gray_box, line_horizontal_dilating_kernel, iterations=2)
     
-    h_gray_box = cv2.erode(gray_box, horizontal_eroding_kernel, iterations=10)
+    h_gray_box = cv2.erode(gray_box, line_horizontal_eroding_kernel, iterations=10)
 
-    v_gray_box = cv2.erode(gray_box, vertical_eroding_kernel, iterations=10)
+    v_gray_box = cv2.erode(gray_box, line_vertical_eroding_kernel, iterations=10)
 
-    h_contours = sorted(
-        cv2.findContours(
-        h_gray_box, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)[0],
-        key=cv2.contourArea,
-        reverse=True)[:h_num]
-    v_contours = sorted(
-        cv2.findContours(
-        v_gray_box, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)[0],
-        key=cv2.contourArea,
-        reverse=True)[:v_num]
+    def largest_lines(lines_img, num, stat):
+        # Keep the num largest components by pixel area via a partial
+        # partition; the line coordinates come straight from the stats
+        # array with no contour tracing or per-contour area calls
+        stats = cv2.connectedComponentsWithStats(lines_img, connectivity=8)[2][1:]
+        if len(stats) > num:
+            stats = stats[np.argpartition(stats[:, cv2.CC_STAT_AREA], -num)[-num:]]
+        return sorted(stats[:, stat].tolist())
 
-    y_list = sorted([h_contours[line][0][0][1] for line in range(len(h_contours))])
-    x_list = sorted([v_contours[line][0][0][0] for line in range(len(v_contours))])
+    y_list = largest_lines(h_gray_box, h_num, cv2.CC_STAT_TOP)
+    x_list = largest_lines(v_gray_box, v_num, cv2.CC_STAT_LEFT)
 
     return x_list, y_list
 
-def ocr_box(
+def prepare_box(
     img,
     coordinates,
     concentrate=False,
@@ -364,12 +512,10 @@ def ocr_box(
     blur=True,
     sharpen=False,
     erode=False,
-    dilate=False,
-    lang='eng',
-    config=''):
+    dilate=False):
     """
-    Detect text in a rectangular part of the image and return the detected string.
- 
+    Crop a rectangular part of the image and preprocess it for OCR.
+
     Parameters
     ----------
     img : numpy.array
@@ -377,36 +523,20 @@ def ocr_box(
     coordinates : iterable
         Iterable containing the x- and y-coordinates of the top left po
         int of the bounding rectangle and its width and height
-    halve : bool, optional
-        Scan half of the rectangle
-    concentrate : bool, optional
-        Scan a smaller part of the box for better results
-    resize : bool, optional
-        Resize the box before scanning
-    blur : bool, optional
-        Blur the box for better results
-    sharpen : bool, optional
-        Sharpen the image
-    erode : bool, optional
-        Make the text thinner
-    dilate : bool, optional
-        Make the text thicker
-    lang : str, optional
-        Language for the Tesseract engine
-    config: str, optional
-        Configuration string for the 'config' parameter of 'pytesseract'
+
+    See `ocr_box` for the preprocessing flags.
 
     Returns
     -------
-    ocr_string : str
-        Detected text contained in the box
+    numpy.array
+        Preprocessed crop, ready to be passed to the Tesseract engine
     """
 
     x, y, w, h = coordinates
 
     if isinstance(halve, str):
         halve, side = halve.split(' ')
-        halve = eval(halve)
+        halve = halve.lower() in ('true', '1', 'yes')
     else:
         side = 'left'
     
@@ -435,18 +565,81 @@ def ocr_box(
         cropped_img = cv2.GaussianBlur(cropped_img, (7,7), 0)
         
     if sharpen:
-        kernel = np.array([
-                    [-1, -1, -1], 
-                    [-1, 9, -1], 
-                    [-1, -1, -1]])
-        cropped_img = cv2.filter2D(cropped_img, -1, kernel)
-        cropped_img = cv2.filter2D(cropped_img, -1, kernel)
+        cropped_img = cv2.filter2D(cropped_img, -1, fused_sharpen_kernel)
 
     if dilate:
         cropped_img = cv2.dilate(cropped_img, (3,3), iterations=2)
-    
 
-    ocr_string = image_to_string(cropped_img, lang=lang, config=config)
+    return cropped_img
+
+def ocr_box(
+    img,
+    coordinates,
+    concentrate=False,
+    halve=False,
+    resize=False,
+    blur=True,
+    sharpen=False,
+    erode=False,
+    dilate=False,
+    lang='eng',
+    config='',
+    psm=None):
+    """
+    Detect text in a rectangular part of the image and return the detected string.
+ 
+    Parameters
+    ----------
+    img : numpy.array
+        Array containing photographic information of the document to be scanned
+    coordinates : iterable
+        Iterable containing the x- and y-coordinates of the top left po
+        int of the bounding rectangle and its width and height
+    halve : bool, optional
+        Scan half of the rectangle
+    concentrate : bool, optional
+        Scan a smaller part of the box for better results
+    resize : bool, optional
+        Resize the box before scanning
+    blur : bool, optional
+        Blur the box for better results
+    sharpen : bool, optional
+        Sharpen the image
+    erode : bool, optional
+        Make the text thinner
+    dilate : bool, optional
+        Make the text thicker
+    lang : str, optional
+        Language for the Tesseract engine
+    config: str, optional
+        Configuration string for the 'config' parameter of 'pytesseract'
+    psm : int, optional
+        Page segmentation mode for the Tesseract engine
+
+    Returns
+    -------
+    ocr_string : str
+        Detected text contained in the box
+    """
+
+    cropped_img = prepare_box(
+                        img,
+                        coordinates,
+                        concentrate=concentrate,
+                        halve=halve,
+                        resize=resize,
+                        blur=blur,
+                        sharpen=sharpen,
+                        erode=erode,
+                        dilate=dilate)
+
+    # An over-aggressive concentrate/halve can leave a pure-white crop;
+    # skip the engine entirely when there is negligible ink
+    ink = int((cropped_img < 128).sum())
+    if ink < 20:
+        return 'None'
+
+    ocr_string = ocr_image(cropped_img, lang=lang, config=config, psm=psm)
     
     return ocr_string.strip() if (ocr_string != '' and ocr_string != 'N/A') else 'None'
 
@@ -460,7 +653,8 @@ def ocr_boxes(
     erode=False,
     dilate=False,
     lang='eng',
-    config=None):
+    config=None,
+    psm=None):
     """
     Detect strings in multiple related boxes and concatenate the results.
     
@@ -482,6 +676,8 @@ def ocr_boxes(
         Language for the Tesseract engine
     config: str, optional
         Configuration string for the 'config' parameter of 'pytesseract'
+    psm : int, optional
+        Page segmentation mode for the Tesseract engine
     
     Returns
     -------
@@ -493,33 +689,38 @@ def ocr_boxes(
     ocr_box
     """
 
-    string_list = []
-
-    for order, box in enumerate(boxes):
-        coordinates = box[1]
-
-        box_string = ocr_box(
-                            img,
-                            coordinates,
-                            halve=halve,
-                            resize=resize,
-                            blur=blur,
-                            sharpen=sharpen,
-                            erode=erode,
-                            dilate=dilate,
-                            lang=lang,
-                            config=config)
-
-        if box_string != 'None' and box_string != 'N/A':
-            string_list.append(box_string)
-    
-    try:
-        string_list[0] #Check if list is empty
-        ocr_string = ' '.join(string_list)
-    except:
-        ocr_string = 'None'
+    crops = [prepare_box(
+                        img,
+                        box_coordinates(box),
+                        halve=halve,
+                        resize=resize,
+                        blur=blur,
+                        sharpen=sharpen,
+                        erode=erode,
+                        dilate=dilate)
+                        for box in boxes]
+
+    if len(crops) == 0:
+        return 'None'
 
-    return ocr_string
+    # Pad the crops to a common width and stack them into one tall
+    # image separated by white bands, so the related boxes cost a
+    # single Tesseract invocation instead of one per box
+    max_width = max(crop.shape[1] for crop in crops)
+
+    stacked = []
+    for crop in crops:
+        pad_width = max_width - crop.shape[1]
+        if pad_width > 0:
+            padding = ((0, 0), (0, pad_width)) + ((0, 0),) * (crop.ndim - 2)
+            crop = np.pad(crop, padding, constant_values=255)
+        separator = np.full((50,) + crop.shape[1:], 255, dtype=crop.dtype)
+        stacked.extend((crop, separator))
+
+    ocr_string = ocr_image(np.vstack(stacked[:-1]), lang=lang, config=config or '', psm=psm)
+    ocr_string = ocr_string.replace('N/A', ' ').strip()
+
+    return ocr_string if ocr_string != '' else 'None'
 
 def ocr_segmented_box(img, coordinates, lang='eng', data_type='number', single=False):
     """
@@ -552,21 +753,17 @@ def ocr_segmented_box(img, coordinates, lang='eng', data_type='number', single=F
     height = cropped_img.shape[0]
     length = cropped_img.shape[1]
     
-    vertical_thickening_kernel = np.ones((3,1), np.uint8)
     vertical_thinning_kernel = np.ones((int(cropped_img.shape[0] * 0.4), 1), np.uint8)
-    horizontal_kernel = np.ones((1,7), np.uint8)
     
-    gray = cv2.cvtColor(cropped_img, cv2.COLOR_BGR2GRAY)
+    gray = cv2.cvtColor(cropped_img, cv2.COLOR_BGR2GRAY) if cropped_img.ndim == 3 else cropped_img
     thresh = cv2.threshold(gray, 120, 255, cv2.THRESH_BINARY)[1]
-    inv = 255 - thresh
+    inv = cv2.bitwise_not(thresh)
 
-    processed_img = cv2.dilate(inv, horizontal_kernel, iterations = 3)
+    processed_img = cv2.dilate(inv, horizontal_thickening_kernel, iterations = 3)
     processed_img = cv2.dilate(processed_img, vertical_thickening_kernel, iterations = 7)
     processed_img = cv2.erode(processed_img, vertical_thinning_kernel, iterations = 10)
 
-    processed_img = img_as_float(processed_img)
-    processed_img = skeletonize(processed_img)
-    processed_img = img_as_ubyte(processed_img)
+    processed_img = skeletonize_image(processed_img)
 
     contours = cv2.findContours(processed_img, cv2.RETR_LIST, cv2.CHAIN_APPROX_NONE)[0]
     contours.sort(key = lambda x: x[0][0][0])
@@ -579,20 +776,20 @@ def ocr_segmented_box(img, coordinates, lang='eng', data_type='number', single=F
         else:
             n_boxes = len(contours)
         
-        step_length = int(length // n_boxes)
+        # One blur over the whole strip replaces n_boxes small blurs,
+        # each of which paid OpenCV's fixed dispatch cost; the slice
+        # bounds come from a single linspace instead of per-step
+        # arithmetic
+        blurred = cv2.GaussianBlur(thresh, (9, 9), 1)
+        bounds = np.linspace(0, length, n_boxes + 1, dtype=np.int32)
 
         img_string_list = []
 
-        box_generator = (
-            thresh[:, step_length * step:min(
-                step_length * (step + 1), length)] 
-                for step in range(n_boxes))
-
-        for order, box in enumerate(box_generator):
-            height, width = box.shape
-            box = box[(height//7) : (height - height//7), (width//7) : (width - width//7)]
-            box = cv2.GaussianBlur(box, (9, 9), 1)
-            box_string = image_to_string(box, lang=lang, config='--psm 10')
+        for order in range(n_boxes):
+            x0, x1 = int(bounds[order]), int(bounds[order + 1])
+            width = x1 - x0
+            box = blurred[(height//7) : (height - height//7), (x0 + width//7) : (x1 - width//7)]
+            box_string = ocr_image(box, lang=lang, psm=10)
 
             if order != 6: # Prevent treating the the seventh digit of 
                            # the second part of the HKID as a letter
@@ -601,7 +798,7 @@ def ocr_segmented_box(img, coordinates, lang='eng', data_type='number', single=F
                 elif single:
                     box_string = clean_single_character(box_string, data_type=data_type)
             else:
-                box_string = re.sub('[^a-zA-Z0-9]', '', box_string)
+                box_string = alnum_regex.sub('', box_string)
                 if not any(letter.isupper() for letter in box_string):
                     box_string = clean_single_character(box_string, data_type='number')
             
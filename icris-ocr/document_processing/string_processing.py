@@ -13,28 +13,56 @@ regex_presentors_telephone = re.compile(r'(?<=Tel[;:\s!])[\s\S!il|soO]*(?=Fax[;:
 regex_presentors_fax = re.compile(r'(?<=Fax[:\s;!])[\s\S]*(?=E(m|-m)ail)')
 regex_presentors_email = re.compile(r'(?<=Email[:;\s!])[\s\S]*@[\s\S]*\.\w{1,}')
 
+# Patterns used on every OCR'd field, compiled once at import so the
+# hot cleaning paths skip the re cache lookup entirely
+# Single-character OCR confusions mapped in one C-level translate
+# pass; note the old chained regexes matched the literal sequences
+# 'oO'/'sS' and so never fired on a lone o, O, s or S
+number_translation = str.maketrans({
+    'I': '1', 'i': '1', 'l': '1', '!': '1', '|': '1', '[': '1', ']': '1',
+    'o': '0', 'O': '0',
+    's': '5', 'S': '5'})
+non_digit_regex = re.compile(r'[^0-9]')
+hkid_regex = re.compile(r'[^A-Z0-9]')
+uppercase_regex = re.compile(r'[^A-Z]')
+
+# Character-class stripping runs as a tight C loop through translate
+# delete tables; non-ASCII (Chinese) characters are dropped up front
+# by an ascii encode, so the tables only need to cover ASCII
+letters = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+alphabet_delete_table = dict.fromkeys(
+    c for c in range(128) if chr(c) not in letters + ' \n')
+chinese_delete_table = dict.fromkeys(
+    c for c in range(128) if chr(c) not in letters + '0123456789,-. \t\n\r\x0b\x0c')
+
+# The call sites only ever use runs of 1, 2 or 3 spaces; anything
+# else falls back to the memoizing lookup below
+separator_regexes = {nSpaces: re.compile(r'\s{%d,}' % nSpaces) for nSpaces in (1, 2, 3)}
+
+def separator_regex(nSpaces):
+    """Return the (memoized) run-of-whitespace pattern for `nSpaces`"""
+
+    if nSpaces not in separator_regexes:
+        separator_regexes[nSpaces] = re.compile(r'\s{%s,}' % nSpaces)
+    return separator_regexes[nSpaces]
+
 def clean_chinese(string: str):
     """Remove Chinese characters and return the cleaned string"""
 
-    string = re.sub(f'[^a-zA-Z,\-0-9\s.]', '', string)
-    return string
+    string = string.encode('ascii', 'ignore').decode()
+    return string.translate(chinese_delete_table)
 
 def check_empty(string: str, delimiter: str = ' '):
     """Check if string represents dirty data"""
     
     string_list = string.split(delimiter)
-    check = 0
 
-    for string in string_list:
-        if len(string) < 3:
-            check += 1
-    
-    if check == len(string_list):
-        string = 'None'
-    else:
-        string = ' '.join(string_list)
+    # any() short-circuits on the first substantial token instead of
+    # counting the short ones across the whole list
+    if not any(len(token) >= 3 for token in string_list):
+        return 'None'
 
-    return string
+    return ' '.join(string_list)
 
 def search_string(regex: re.compile, input_string: str):
     """Construct a regular expression and match it in the passed string"""
@@ -56,7 +84,7 @@ def separate_text(
     """Separate different names in the same column delimited by two or more newline characters"""
 
     string = clean_chinese(string.replace('\n', ' ').strip())
-    string = re.sub(r'\s{%s,}' % nSpaces, ';', string)
+    string = separator_regex(nSpaces).sub(';', string)
 
     string_list = [string for string in string.split(';') if string != '']
 
@@ -71,16 +99,11 @@ def separate_text(
 
 def clean_alphabet(string: str):
     """Remove all non-alphabet characters and returned the cleaned string"""
-    cleaned = re.sub(r'[^A-Za-z \n]', '', string)
+    cleaned = string.encode('ascii', 'ignore').decode().translate(alphabet_delete_table)
     cleaned = cleaned.replace('\n', ' ').replace('  ', ' ')
     cleaned_list = cleaned.split()
-    
-    check_empty = 0
-    for string in cleaned_list:
-        if len(string) < 3:
-            check_empty += 1
 
-    if check_empty == len(cleaned_list):
+    if not any(len(token) >= 3 for token in cleaned_list):
         cleaned_list = ['None']
 
     cleaned = ' '.join(cleaned_list)
@@ -97,8 +120,8 @@ def clean_number(
     except:
         pass
 
-    cleaned = re.sub(r'sS', '5', re.sub(r'oO', '0', re.sub(r'[\[\]Iil!|]', '1', string)))
-    cleaned = re.sub(r'[^0-9]', '', cleaned)
+    cleaned = string.translate(number_translation)
+    cleaned = non_digit_regex.sub('', cleaned)
 
     if data_type == 'contact':
         if cleaned.startswith('852'):
@@ -111,29 +134,22 @@ def clean_number(
         else:
             cleaned = 'None'
 
-    elif data_type == 'number':
-        cleaned = re.sub(r'[^0-9]', '', cleaned)
-
     return cleaned if cleaned != '' and cleaned != '()' else 'None'
 
 def clean_hkid(string: str):
     """Check if HKID was detected correctly and reformat
     the detected string"""
 
-    cleaned = re.sub(r'[^A-Z0-9]', '', string)
-    cleaned_list = [letter for letter in cleaned]
-    cleaned_list.insert(-1, '(')
-    cleaned_list.append(')')
-    cleaned = ''.join(cleaned_list)
+    cleaned = hkid_regex.sub('', string)
 
-    return cleaned if len(cleaned) > 7 else 'None'
+    return f'{cleaned[:-1]}({cleaned[-1]})' if len(cleaned) > 5 else 'None'
 
 def clean_single_character(string: str, data_type: str = 'letter'):
     """Clean a string that is expected to contain only a character"""
 
     if data_type == 'letter':
-        cleaned = re.sub(r'[^A-Z]', '', string.strip())[:1]
+        cleaned = uppercase_regex.sub('', string.strip())[:1]
     elif data_type == 'number':
-        cleaned = re.sub(r'sS', '5', re.sub(r'oO', '0', re.sub(r'[\[\]Iil!|]', '1', string)))
-        cleaned = re.sub(r'[^0-9]', '', cleaned)[:1]
+        cleaned = string.translate(number_translation)
+        cleaned = non_digit_regex.sub('', cleaned)[:1]
     return cleaned